@@ -18,8 +18,9 @@ from openai import OpenAI
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from config.app_config import RATE_LIMIT_HEALTHZ_PER_MINUTE, SESSION_TTL_MINUTES, STREAMING_TIMEOUT_SECONDS
+from config.app_config import RATE_LIMIT_HEALTHZ_PER_MINUTE, RESPONSE_CACHE_SIZE, SESSION_TTL_MINUTES, STREAMING_TIMEOUT_SECONDS
 from coach import CoachAgent, run_rag_sanity_check
+from coach.response_cache import ResponseCache
 from rag.config import load_rag_config, DATA_DIR, MASTER_FILENAME
 from rag.parsing_master import parse_lesson_overviews
 from rag.retriever import RagRetriever
@@ -60,8 +61,19 @@ except (OSError, ValueError) as exc:
     logger.warning(f"Failed to load lesson overviews at startup: {exc}")
 
 
+# Exact-prompt reply cache shared across sessions; disabled unless RESPONSE_CACHE_SIZE > 0
+_response_cache = ResponseCache(RESPONSE_CACHE_SIZE) if RESPONSE_CACHE_SIZE > 0 else None
+
+
 def _agent_factory() -> CoachAgent:
-    return CoachAgent(client=client, model=config.chat_model, retriever=retriever, router=QueryRouter(), lesson_overviews=_lesson_overviews)
+    return CoachAgent(
+        client=client,
+        model=config.chat_model,
+        retriever=retriever,
+        router=QueryRouter(),
+        lesson_overviews=_lesson_overviews,
+        response_cache=_response_cache,
+    )
 
 
 session_store = InMemorySessionStore(_agent_factory, ttl_minutes=SESSION_TTL_MINUTES)
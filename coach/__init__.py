@@ -3,7 +3,7 @@
 "initializes OpenAI client, state, history"
 
 from .agent import CoachAgent
-from .state import ConversationState, LayerSignals, LayerInference
+from .state import ConversationState, LayerSignals, LayerInference, TurnInference
 from .constants import (
     LAYER_CONFIDENCE_THRESHOLD,
     FREQUENCY_QUESTION,
@@ -12,10 +12,12 @@ from .constants import (
 )
 from .inference import (
     infer_process_layer,
+    classify_batch,
     pick_layer_question,
     infer_barrier,
     infer_activities,
     infer_time_available,
+    infer_turn,
 )
 from .diagnostics import run_rag_sanity_check
 
@@ -24,14 +26,17 @@ __all__ = [
     "ConversationState",
     "LayerSignals",
     "LayerInference",
+    "TurnInference",
     "LAYER_CONFIDENCE_THRESHOLD",
     "FREQUENCY_QUESTION",
     "ROUTINE_QUESTION",
     "TIMEFRAME_QUESTION",
     "infer_process_layer",
+    "classify_batch",
     "pick_layer_question",
     "infer_barrier",
     "infer_activities",
     "infer_time_available",
+    "infer_turn",
     "run_rag_sanity_check",
 ]
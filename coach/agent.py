@@ -4,53 +4,51 @@ from __future__ import annotations
 
 import re
 import logging
-from typing import Dict, Generator, List, Optional, Pattern
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Deque, Dict, Final, Generator, Iterator, List, Optional, Pattern
 
-from openai import OpenAI
-
-from coach.prompts import build_coach_prompt
-from rag.retriever import RagRetriever, RetrievalResult, RetrievedChunk
+from coach.prompts import BASE_PROMPT, state_block_for
 from rag.router import QueryRouter, RouteDecision
 
 # Import from new modules
 from .constants import (
+    HISTORY_COMPACT_EXCHANGES,
     LAYER_CONFIDENCE_THRESHOLD,
     MAX_HISTORY_MESSAGES,
+    MAX_HISTORY_TOKENS,
     MAX_INPUT_LENGTH,
     REFERENCE_POOL_SIZE,
     EARLY_LESSON_MAX,
     EARLY_LESSON_MARGIN,
     TIMEFRAME_QUESTION,
 )
+from .response_cache import ResponseCache
 from .state import ConversationState, _PreparedPrompt
 from .inference import (
-    infer_process_layer,
+    _infer_turn_lowered,
     pick_layer_question,
-    infer_barrier,
-    infer_activities,
-    infer_time_available,
-    SOURCE_REQUEST_PATTERNS,
-    ACTION_SUGGESTION_PATTERNS,
+    ACTION_SUGGESTION_RE,
 )
 from .detection.detectors import (
-    detect_lowest_mpac,
-    detect_general_disinterest,
-    detect_emotion_regulation,
-    detect_module_request,
-    detect_lesson_lookup,
-    detect_educational_use_case,
-    detect_mpac_question,
-    detect_sources_only,
+    IntentFlags,
+    classify_intent,
     detect_lesson_overview_request,
-    detect_technical_support_request,
-    detect_chatbot_help_request,
 )
 from .inference import TECHNICAL_SUPPORT_RESPONSE, CHATBOT_HELP_RESPONSE
 
+# Annotation-only: the OpenAI SDK and the llama_index/qdrant stack behind rag.retriever take
+# seconds to import, and callers that construct CoachAgent have already imported them
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+    from rag.retriever import RagRetriever, RetrievalResult, RetrievedChunk
+
 logger = logging.getLogger(__name__)
 
 # Compiled once at import time — used in _validate_input() on every message
-_INJECTION_PATTERNS: List[Pattern] = [
+_INJECTION_PATTERNS: Final[List[Pattern]] = [
     re.compile(r"ignore\s+(?:all\s+)?(?:previous|above|prior)\s+(?:instructions|prompts?|commands?)", re.IGNORECASE),
     re.compile(r"disregard\s+(?:all\s+)?(?:previous|above|prior)\s+(?:instructions|prompts?)", re.IGNORECASE),
     re.compile(r"new\s+instructions?:", re.IGNORECASE),
@@ -60,6 +58,19 @@ _INJECTION_PATTERNS: List[Pattern] = [
     re.compile(r"\[ADMIN\]", re.IGNORECASE),
 ]
 
+# Response post-processing patterns, compiled once instead of per call via re.sub/re.split
+# Exchanges block compaction never evicts while the history limit leaves room for them
+_MIN_KEPT_EXCHANGES: Final[int] = 2
+# Turns memoized per agent: short replies ("yes", "not really", "20 minutes") recur in a session
+_TURN_MEMO_SIZE: Final[int] = 128
+_MD_BULLET_RE: Final[Pattern] = re.compile(r"^\s*[-*]\s+", re.MULTILINE)
+_MD_NUMBERED_RE: Final[Pattern] = re.compile(r"^\s*\d+\.\s+", re.MULTILINE)
+_SENTENCE_SPLIT_RE: Final[Pattern] = re.compile(r"(?<=[.!?])\s+")
+# Matched against lowercased sentences; case-sensitive scans are ~3x faster than IGNORECASE
+_MODULE_REFERENCE_RE: Final[Pattern] = re.compile(
+    r"(you can find|find) more detail|you should check out these module|you can find that in the module"
+)
+
 
 class CoachAgent:
     """Handles conversation state, prompting, and OpenAI calls."""
@@ -75,6 +86,7 @@ class CoachAgent:
         retriever: Optional[RagRetriever] = None,
         router: Optional[QueryRouter] = None,
         lesson_overviews: Optional[Dict[int, Dict[str, str]]] = None,
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         self.client = client
         self.model = model
@@ -84,12 +96,19 @@ class CoachAgent:
         self._is_new_gen = model.startswith("gpt-5") or model.startswith("o")
         self._token_limit_key = "max_completion_tokens" if self._is_new_gen else "max_tokens"
         self.state = ConversationState()
-        self.history: List[Dict[str, str]] = []
+        # Bounded by MAX_HISTORY_MESSAGES; with HISTORY_COMPACT_EXCHANGES set, _compact_history
+        # evicts whole exchanges in blocks before the deque has to
+        self.history: Deque[Dict[str, str]] = deque(maxlen=MAX_HISTORY_MESSAGES)
         self.retriever = retriever
         self.router = router or QueryRouter()
+        # Per-agent rather than module-level, so user text is dropped with the session
+        self._infer_turn = lru_cache(maxsize=_TURN_MEMO_SIZE)(_infer_turn_lowered)
         self.latest_retrieval: Optional[RetrievalResult] = None
         self.last_retrieval_with_results: Optional[RetrievalResult] = None
         self._last_prefer_science: bool = False
+        self.response_cache = response_cache
+        # Invariant across turns and sessions, so it stays first and forms a provider-cacheable prefix
+        self._system_prefix: str = BASE_PROMPT
         if lesson_overviews is not None:
             self.lesson_overviews = lesson_overviews
         else:
@@ -146,17 +165,6 @@ class CoachAgent:
                 # The system prompt includes instructions to resist manipulation
                 break
 
-    def _truncate_history(self) -> None:
-        """
-        Truncate conversation history to prevent memory exhaustion.
-
-        Keeps the most recent MAX_HISTORY_MESSAGES messages.
-        """
-        if len(self.history) > MAX_HISTORY_MESSAGES:
-            messages_to_remove = len(self.history) - MAX_HISTORY_MESSAGES
-            logger.info(f"Truncating history: removing {messages_to_remove} oldest messages")
-            self.history = self.history[-MAX_HISTORY_MESSAGES:]
-
     def generate_response(self, user_input: str) -> str:
         # Validate input first
         self._validate_input(user_input)
@@ -166,6 +174,10 @@ class CoachAgent:
             assistant_reply = prepared.override_text
             self._record_exchange(user_input, assistant_reply)
             return assistant_reply
+        cached_reply = self._get_cached_reply(prepared)
+        if cached_reply is not None:
+            self._record_exchange(user_input, cached_reply)
+            return cached_reply
 
         completion = self.client.chat.completions.create(
             model=self.model,
@@ -180,6 +192,7 @@ class CoachAgent:
         )
         assistant_reply = self._maybe_append_citations(assistant_reply, prepared)
         assistant_reply = self._replace_em_dash(assistant_reply)
+        self._cache_reply(prepared, assistant_reply)
         self._record_exchange(user_input, assistant_reply)
         return assistant_reply
 
@@ -193,6 +206,11 @@ class CoachAgent:
             self._record_exchange(user_input, reply)
             yield reply
             return reply
+        cached_reply = self._get_cached_reply(prepared)
+        if cached_reply is not None:
+            self._record_exchange(user_input, cached_reply)
+            yield cached_reply
+            return cached_reply
         if prepared.response_mode in {"lowest_mpac", "emotion_education", "educational", "source_request", "mpac_question", "home_resources"}:
             completion = self.client.chat.completions.create(
                 model=self.model,
@@ -207,6 +225,7 @@ class CoachAgent:
             )
             assistant_reply = self._maybe_append_citations(assistant_reply, prepared)
             assistant_reply = self._replace_em_dash(assistant_reply)
+            self._cache_reply(prepared, assistant_reply)
             self._record_exchange(user_input, assistant_reply)
             yield assistant_reply
             return assistant_reply
@@ -232,10 +251,20 @@ class CoachAgent:
         final_reply = self._replace_em_dash(final_reply)
         trailing = final_reply[len(assistant_reply) :]
         if trailing:
-            yield self._replace_em_dash(trailing)
+            yield trailing
+        self._cache_reply(prepared, final_reply)
         self._record_exchange(user_input, final_reply)
         return final_reply
 
+    def _get_cached_reply(self, prepared: _PreparedPrompt) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(prepared.messages, model=self.model)
+
+    def _cache_reply(self, prepared: _PreparedPrompt, reply: str) -> None:
+        if self.response_cache is not None and reply:
+            self.response_cache.put(prepared.messages, reply, model=self.model)
+
     def snapshot(self) -> Dict[str, str]:
         """Return a shallow snapshot of the coach state for monitoring."""
 
@@ -244,14 +273,16 @@ class CoachAgent:
         return mapping
 
     def _prepare_prompt(self, user_input: str) -> _PreparedPrompt:
-        self._update_state(user_input)
+        lowered = user_input.lower()
+        self._update_state(user_input, lowered=lowered)
         context_block = None
         self.latest_retrieval = None
         routing_instruction: Optional[str] = None
         decision: Optional[RouteDecision] = None
-        sources_only_followup = detect_sources_only(user_input)
-        mpac_question = detect_mpac_question(user_input)
-        if self.retriever and not sources_only_followup:
+        flags = classify_intent(user_input, lowered=lowered)
+        sources_only = bool(flags & IntentFlags.SOURCES_ONLY)
+        mpac_question = bool(flags & IntentFlags.MPAC_QUESTION)
+        if self.retriever and not sources_only:
             decision = self.router.route(user_input)
             if mpac_question:
                 decision = RouteDecision(
@@ -270,17 +301,14 @@ class CoachAgent:
             if retrieval_result and (retrieval_result.master_chunks or retrieval_result.activity_chunks or retrieval_result.home_chunks):
                 self.last_retrieval_with_results = retrieval_result
 
-        source_request = self._needs_citations(user_input)
-        sources_only = sources_only_followup
-        lesson_lookup = detect_lesson_lookup(user_input)
-        explicit_module_request = source_request or detect_module_request(user_input) or lesson_lookup
-        general_disinterest = detect_general_disinterest(user_input)
-        lowest_mpac = detect_lowest_mpac(user_input) or general_disinterest
-        emotion_regulation = detect_emotion_regulation(user_input)
-        educational_use_case = detect_educational_use_case(
-            user_input,
-            explicit_module_request=explicit_module_request,
-            decision=decision,
+        source_request = bool(flags & IntentFlags.SOURCE_REQUEST)
+        lesson_lookup = bool(flags & IntentFlags.LESSON_LOOKUP)
+        explicit_module_request = bool(flags & IntentFlags.MODULE_REQUEST)
+        general_disinterest = bool(flags & IntentFlags.GENERAL_DISINTEREST)
+        lowest_mpac = bool(flags & IntentFlags.LOWEST_MPAC)
+        emotion_regulation = bool(flags & IntentFlags.EMOTION_REGULATION)
+        educational_use_case = explicit_module_request or (
+            bool(flags & IntentFlags.EDUCATIONAL_REQUEST) and not (decision and decision.use_activities)
         )
 
         home_request = decision.use_home if decision else False
@@ -419,10 +447,10 @@ class CoachAgent:
         override_citations = False
         override_text = ""
         reference_block_references: List[str] = []
-        if detect_technical_support_request(user_input):
+        if flags & IntentFlags.TECHNICAL_SUPPORT:
             override_text = TECHNICAL_SUPPORT_RESPONSE
             override_citations = True
-        if detect_chatbot_help_request(user_input):
+        if flags & IntentFlags.CHATBOT_HELP:
             override_text = CHATBOT_HELP_RESPONSE
             override_citations = True
         lesson_overview_num = detect_lesson_overview_request(user_input)
@@ -438,12 +466,13 @@ class CoachAgent:
             override_citations = True
         if source_request:
             prefer_science_refs = (decision.prefer_science if decision else False) or (sources_only and self._last_prefer_science)
+            pool_limit = self._reference_pool_limit(reference_source)
             source_chunks = self._select_reference_chunks(
                 reference_source,
-                max_refs=self._reference_pool_limit(reference_source),
+                max_refs=pool_limit,
                 prefer_early_lessons=False,
                 prefer_science=prefer_science_refs,
-                pool_limit=self._reference_pool_limit(reference_source),
+                pool_limit=pool_limit,
             )
             reference_block_references = self._format_reference_list(source_chunks)
             if reference_block_references and sources_only:
@@ -480,17 +509,56 @@ class CoachAgent:
 
     def _record_exchange(self, user_input: str, assistant_reply: str) -> None:
         """
-        Record conversation exchange and truncate history if needed.
+        Record conversation exchange; the deque keeps the last MAX_HISTORY_MESSAGES (or
+        _compact_history evicts in blocks first), and MAX_HISTORY_TOKENS (when set) trims it
+        further by estimated size.
 
         Args:
             user_input: User's message
             assistant_reply: Assistant's response
         """
+        self._compact_history()
         self.history.append({"role": "user", "content": user_input})
         self.history.append({"role": "assistant", "content": assistant_reply})
+        if MAX_HISTORY_TOKENS > 0:
+            self._trim_history_to_budget(MAX_HISTORY_TOKENS)
+
+    def _compact_history(self) -> None:
+        """
+        Drop a block of the oldest exchanges from a full history when HISTORY_COMPACT_EXCHANGES is set.
+
+        Letting the deque evict one exchange per turn shifts the replayed window every turn once
+        it fills, so the provider can only reuse the cached BASE_PROMPT. Evicting
+        HISTORY_COMPACT_EXCHANGES whole exchanges at once keeps system prompt + history
+        byte-identical (and cacheable) until the next compaction, at the cost of replaying fewer
+        old turns in between. The latest _MIN_KEPT_EXCHANGES exchanges are always kept when the
+        limit leaves room for them. With the setting at 0 the deque's sliding window applies.
+        """
+        limit = self.history.maxlen
+        if HISTORY_COMPACT_EXCHANGES <= 0 or limit is None or len(self.history) + 2 <= limit:
+            return
+        # Whole exchanges only, so the transcript still starts on a user message
+        needed = len(self.history) + 2 - limit
+        needed += needed % 2
+        floor = len(self.history) - 2 * _MIN_KEPT_EXCHANGES
+        drop = max(needed, min(2 * HISTORY_COMPACT_EXCHANGES, floor))
+        for _ in range(min(drop, len(self.history))):
+            self.history.popleft()
+
+    def _trim_history_to_budget(self, max_tokens: int) -> None:
+        """
+        Drop the oldest exchanges until the replayed history fits an approximate token budget.
 
-        # Truncate history to prevent unbounded growth
-        self._truncate_history()
+        Tokens are estimated at ~4 characters each rather than with a tokenizer: the budget is a
+        cost guard, not an exact context-window check, and history is at most MAX_HISTORY_MESSAGES
+        entries, so summing lengths each turn is cheap. The latest exchange is always kept.
+        """
+        max_chars = max_tokens * 4
+        total = sum(len(message["content"]) for message in self.history)
+        while total > max_chars and len(self.history) > 2:
+            # Pop user/assistant pairs so the transcript never starts mid-exchange
+            total -= len(self.history.popleft()["content"])
+            total -= len(self.history.popleft()["content"])
 
     def _build_messages(
         self,
@@ -501,8 +569,10 @@ class CoachAgent:
         response_instruction: Optional[str] = None,
         module_reference_instruction: Optional[str] = None,
     ) -> List[Dict[str, str]]:
-        system_prompt = build_coach_prompt(self.state.to_prompt_mapping())
-        messages: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
+        # Static prefix first, then history, then everything that changes per turn. Keeping
+        # the leading tokens identical across turns lets the provider reuse its prompt cache.
+        messages: List[Dict[str, str]] = [{"role": "system", "content": self._system_prefix}]
+        messages.extend(self.history)
         if context_block:
             retrieval_instruction = self._build_retrieval_instruction(response_mode)
             messages.append({"role": "system", "content": f"{retrieval_instruction}\n\n{context_block}"})
@@ -512,7 +582,16 @@ class CoachAgent:
             messages.append({"role": "system", "content": module_reference_instruction})
         if routing_instruction:
             messages.append({"role": "system", "content": routing_instruction})
-        messages.extend(self.history)
+        state = self.state
+        state_block = state_block_for(
+            process_layer=state.process_layer,
+            layer_confidence=state.layer_confidence,
+            pending_layer_question=state.pending_layer_question,
+            barrier=state.barrier,
+            activities=state.activities,
+            time_available=state.time_available,
+        )
+        messages.append({"role": "system", "content": state_block})
         messages.append({"role": "user", "content": user_input})
         return messages
 
@@ -595,9 +674,16 @@ class CoachAgent:
             return []
         pool = ranked
         if prefer_early_lessons:
-            early = [chunk for chunk in pool if (chunk.metadata.get("lesson_number") or 0) <= EARLY_LESSON_MAX]
+            # One pass: collect early-lesson chunks and note whether the top chunk is one of them,
+            # instead of a second `pool[0] in early` scan using dataclass field-by-field __eq__
+            early: List[RetrievedChunk] = []
+            top_is_early = False
+            for index, chunk in enumerate(pool):
+                if (chunk.metadata.get("lesson_number") or 0) <= EARLY_LESSON_MAX:
+                    early.append(chunk)
+                    if index == 0:
+                        top_is_early = True
             if early:
-                top_is_early = pool[0] in early
                 if top_is_early:
                     pool = early
                 else:
@@ -670,17 +756,41 @@ class CoachAgent:
     @staticmethod
     def _strip_markdown(text: str) -> str:
         cleaned = text.replace("**", "").replace("__", "")
-        cleaned = re.sub(r"^\s*[-*]\s+", "", cleaned, flags=re.MULTILINE)
-        cleaned = re.sub(r"^\s*\d+\.\s+", "", cleaned, flags=re.MULTILINE)
+        cleaned = _MD_BULLET_RE.sub("", cleaned)
+        cleaned = _MD_NUMBERED_RE.sub("", cleaned)
         return cleaned
 
     @staticmethod
     def _replace_em_dash(text: str) -> str:
+        # Called on every streamed delta; most contain no em dash, so skip the replace entirely
+        if "—" not in text:
+            return text
         return text.replace("—", "-")
 
     @staticmethod
     def _split_sentences(text: str) -> List[str]:
-        return re.split(r"(?<=[.!?])\s+", text.strip())
+        return _SENTENCE_SPLIT_RE.split(text.strip())
+
+    @classmethod
+    def _iter_content_sentences(
+        cls,
+        cleaned: str,
+        *,
+        drop_action_suggestions: bool,
+        drop_module_references: bool,
+    ) -> Iterator[str]:
+        """Lazily yield stripped, non-question sentences that survive the mode's filters."""
+        for raw in cls._split_sentences(cleaned):
+            sentence = raw.strip()
+            if not sentence or "?" in sentence:
+                continue
+            if drop_action_suggestions or drop_module_references:
+                lowered = sentence.lower()
+                if drop_action_suggestions and ACTION_SUGGESTION_RE.search(lowered):
+                    continue
+                if drop_module_references and _MODULE_REFERENCE_RE.search(lowered):
+                    continue
+            yield sentence
 
     def _postprocess_response(
         self,
@@ -692,41 +802,32 @@ class CoachAgent:
         if response_mode not in {"lowest_mpac", "emotion_education", "educational", "source_request"}:
             return self._replace_em_dash(text)
         cleaned = self._replace_em_dash(self._strip_markdown(text))
-        sentences = [sentence.strip() for sentence in self._split_sentences(cleaned) if sentence.strip()]
-        sentences = [sentence for sentence in sentences if "?" not in sentence]
-        if response_mode in {"lowest_mpac", "emotion_education", "educational"}:
-            filtered: List[str] = []
-            for sentence in sentences:
-                lowered = sentence.lower()
-                if any(re.search(pattern, lowered) for pattern in ACTION_SUGGESTION_PATTERNS):
-                    continue
-                filtered.append(sentence)
-            sentences = filtered
-        if module_reference_sentence:
-            sentences = [
-                s for s in sentences
-                if not re.search(r"(you can find|find) more detail|you should check out these module|you can find that in the module", s, re.IGNORECASE)
-            ]
         if response_mode == "source_request":
             max_content = 2
         else:
             max_content = 2 if module_reference_sentence else 3
-        content = " ".join(sentences[:max_content]).strip()
+        sentences = self._iter_content_sentences(
+            cleaned,
+            drop_action_suggestions=response_mode in {"lowest_mpac", "emotion_education", "educational"},
+            drop_module_references=bool(module_reference_sentence),
+        )
+        # islice stops pulling (and regex-filtering) sentences once max_content have been kept
+        content = " ".join(islice(sentences, max_content)).strip()
         if module_reference_sentence:
             if content:
                 return f"{content} {module_reference_sentence}".strip()
             return module_reference_sentence.strip()
         return content
 
-    def _needs_citations(self, user_input: str) -> bool:
-        return any(pattern.search(user_input) for pattern in SOURCE_REQUEST_PATTERNS)
-
     def _append_reference_block(self, base_text: str, references: List[str], max_refs: int = 1) -> str:
-        limited = references[:max_refs]
+        # Citation callers pass max_refs=len(references); skip the no-op slice copy in that case
+        limited = references[:max_refs] if max_refs < len(references) else references
         if limited:
-            module_block = "\n\n".join(f"- {ref}" for ref in limited)
-            prefix = f"{base_text}\n\n" if base_text else ""
-            return f"{prefix}From your modules, you can find more detail at:\n{module_block}"
+            # One join + one f-string: no per-reference "- ..." strings, prefix or block intermediates
+            block = "\n\n- ".join(limited)
+            if base_text:
+                return f"{base_text}\n\nFrom your modules, you can find more detail at:\n- {block}"
+            return f"From your modules, you can find more detail at:\n- {block}"
         fallback_msg = (
             "I couldn't find a specific slide to cite for that. "
             "If you can share more detail about what you'd like to know, I can point to a specific lesson."
@@ -739,11 +840,12 @@ class CoachAgent:
 
         return [reference for reference in references if reference.startswith("Lesson ")]
 
-    def _update_state(self, user_input: str) -> None:
-        layer_inference = infer_process_layer(user_input)
-        barrier = infer_barrier(user_input)
-        activities = infer_activities(user_input)
-        time_available = infer_time_available(user_input)
+    def _update_state(self, user_input: str, *, lowered: Optional[str] = None) -> None:
+        turn = self._infer_turn(lowered if lowered is not None else user_input.lower())
+        layer_inference = turn.layer
+        barrier = turn.barrier
+        activities = turn.activities
+        time_available = turn.time_available
 
         if layer_inference.layer and layer_inference.confidence >= LAYER_CONFIDENCE_THRESHOLD:
             self.state.process_layer = layer_inference.layer
@@ -1,10 +1,14 @@
 """Constants, thresholds, keyword lists, and questions for the coach module."""
 
+from typing import Final, Tuple
+
 from config.app_config import (
     EARLY_LESSON_MARGIN,
     EARLY_LESSON_MAX,
+    HISTORY_COMPACT_EXCHANGES,
     LAYER_CONFIDENCE_THRESHOLD,
     MAX_HISTORY_MESSAGES,
+    MAX_HISTORY_TOKENS,
     MAX_MESSAGE_LENGTH as MAX_INPUT_LENGTH,
     REFERENCE_MIN_SCORE,
     REFERENCE_POOL_SIZE,
@@ -12,7 +16,8 @@ from config.app_config import (
     STREAMING_TIMEOUT_SECONDS,
 )
 
-# Keyword lists for layer detection
+# Keyword lists for layer detection. All of these are substring-scanned via _contains_keywords
+# (never exact membership), so they stay lists; redundant superstrings are pruned at import.
 ROUTINE_KEYWORDS = [
     "part of my routine",
     "part of my day",
@@ -153,6 +158,186 @@ ACTIVITY_CONTEXT_KEYWORDS = [
     "fitness",
 ]
 
+# Short replies common enough to get a precomputed layer inference (exact lowered text, with
+# trailing "." / "!" variants); see _infer_process_layer_lowered.
+ACKNOWLEDGEMENT_REPLIES = [
+    "ok",
+    "okay",
+    "k",
+    "yes",
+    "yeah",
+    "yep",
+    "no",
+    "nope",
+    "sure",
+    "thanks",
+    "thank you",
+    "got it",
+    "cool",
+    "great",
+    "alright",
+    "sounds good",
+    "hi",
+    "hello",
+]
+
+# (label, keywords) pairs for barrier and activity inference. Checked in order: the first matching
+# barrier wins and every matching activity is reported. Substring-scanned like the lists above;
+# tuples because these are fixed tables read on every turn, never edited at runtime.
+BARRIER_MAP: Final[Tuple[Tuple[str, Tuple[str, ...]], ...]] = (
+    (
+        "time pressure",
+        (
+            "busy",
+            "no time",
+            "schedule",
+            "travel",
+            "work",
+            "appointments",
+            "errands",
+            "looking after",
+            "caregiving",
+            "day gets away",
+        ),
+    ),
+    (
+        "motivation dip",
+        (
+            "motivation",
+            "don't feel",
+            "lazy",
+            "energy",
+            "tired",
+            "drained",
+            "low energy",
+            "worn out",
+            "hard to get going",
+            "no drive",
+            "can't get motivated",
+        ),
+    ),
+    (
+        "weather",
+        (
+            "weather",
+            "cold",
+            "hot",
+            "rain",
+            "snow",
+            "winter",
+            "icy",
+            "slippery",
+            "too hot",
+            "too cold",
+        ),
+    ),
+    (
+        "pain or discomfort",
+        (
+            "pain",
+            "ache",
+            "sore",
+            "injury",
+            "hurt",
+            "stiff",
+            "stiffness",
+            "joint pain",
+            "back pain",
+            "knee pain",
+        ),
+    ),
+    (
+        "confidence",
+        (
+            "nervous",
+            "intimidated",
+            "embarrassed",
+            "worried",
+            "afraid",
+            "fear of falling",
+            "not confident",
+        ),
+    ),
+)
+
+ACTIVITY_MAP: Final[Tuple[Tuple[str, Tuple[str, ...]], ...]] = (
+    (
+        "walking",
+        (
+            "walk",
+            "walking",
+            "hike",
+            "go for a walk",
+            "walking outside",
+            "walking group",
+            "group walk",
+            "walking club",
+        ),
+    ),
+    (
+        "light strength",
+        (
+            "strength",
+            "weights",
+            "dumbbell",
+            "resistance",
+            "band",
+            "strength training",
+            "bodyweight",
+            "light weights",
+        ),
+    ),
+    (
+        "mobility",
+        (
+            "stretch",
+            "stretching",
+            "mobility",
+            "yoga",
+            "range of motion",
+            "flexibility",
+            "tai chi",
+            "taichi",
+        ),
+    ),
+    (
+        "cycling",
+        (
+            "bike",
+            "cycling",
+            "spin",
+            "stationary bike",
+            "exercise bike",
+        ),
+    ),
+    (
+        "swimming",
+        (
+            "swim",
+            "swimming",
+            "pool",
+            "water",
+            "aquafit",
+            "water aerobics",
+            "aqua fitness",
+        ),
+    ),
+    (
+        "golf",
+        (
+            "golf",
+            "golfing",
+            "driving range",
+        ),
+    ),
+    (
+        "pickleball",
+        (
+            "pickleball",
+        ),
+    ),
+)
+
 # Clarifying questions for layer inference
 FREQUENCY_QUESTION = "In the last 7 days, about how many days did you do any purposeful movement, even a short walk counts?"
 ROUTINE_QUESTION = "Do you already have something you do most weeks, or are you still figuring out what could work?"
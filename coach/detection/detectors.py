@@ -1,22 +1,23 @@
 """Detection functions for user intent and emotional state."""
 
 import re
+from enum import IntFlag, auto
 from typing import Optional
 
-from .text_match import _contains_patterns, _contains_keywords
+from .text_match import _contains_keywords, _minimal_keywords
 from ..inference import (
-    LOWEST_MPAC_STRONG_PATTERNS,
-    LOWEST_MPAC_ACTIVITY_PATTERNS,
-    GENERAL_DISINTEREST_PATTERNS,
-    EMOTION_STRONG_PATTERNS,
-    EMOTION_WEAK_PATTERNS,
-    MODULE_REQUEST_PATTERNS,
-    LESSON_LOOKUP_PATTERNS,
-    EDUCATIONAL_REQUEST_PATTERNS,
-    MPAC_QUESTION_PATTERNS,
-    SOURCE_REQUEST_PATTERNS,
-    TECHNICAL_SUPPORT_PATTERNS,
-    CHATBOT_HELP_PATTERNS,
+    LOWEST_MPAC_STRONG_RE,
+    LOWEST_MPAC_ACTIVITY_RE,
+    GENERAL_DISINTEREST_RE,
+    EMOTION_STRONG_RE,
+    EMOTION_WEAK_RE,
+    MODULE_REQUEST_RE,
+    LESSON_LOOKUP_RE,
+    EDUCATIONAL_REQUEST_RE,
+    MPAC_QUESTION_RE,
+    SOURCE_REQUEST_RE,
+    TECHNICAL_SUPPORT_RE,
+    CHATBOT_HELP_RE,
     extract_lesson_number,
 )
 from ..constants import ACTIVITY_CONTEXT_KEYWORDS
@@ -25,45 +26,71 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from rag.router import RouteDecision
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_ACTIVITY_CONTEXT_SCAN = _minimal_keywords(ACTIVITY_CONTEXT_KEYWORDS)
 
-def detect_lowest_mpac(text: str) -> bool:
-    """Detect if user expresses lowest M-PAC (unmotivated/disengaged language)."""
-    lowered = text.lower()
-    if _contains_patterns(lowered, LOWEST_MPAC_STRONG_PATTERNS):
+
+# Each detector has a private "_lowered" form that expects text.lower() from the caller, so
+# classify_intent() lowercases the turn once instead of once per detector.
+
+
+def _lowest_mpac_lowered(lowered: str) -> bool:
+    if LOWEST_MPAC_STRONG_RE.search(lowered):
         return True
-    if _contains_patterns(lowered, LOWEST_MPAC_ACTIVITY_PATTERNS):
+    return LOWEST_MPAC_ACTIVITY_RE.search(lowered) is not None
+
+
+def _general_disinterest_lowered(lowered: str) -> bool:
+    if "?" in lowered:
+        return False
+    return GENERAL_DISINTEREST_RE.search(lowered) is not None
+
+
+def _emotion_regulation_lowered(lowered: str) -> bool:
+    if EMOTION_STRONG_RE.search(lowered):
         return True
-    return False
+    return EMOTION_WEAK_RE.search(lowered) is not None and _contains_keywords(lowered, _ACTIVITY_CONTEXT_SCAN)
+
+
+def _sources_only_lowered(lowered: str) -> bool:
+    return SOURCE_REQUEST_RE.search(lowered) is not None and _only_source_terms(lowered)
+
+
+def _only_source_terms(lowered: str) -> bool:
+    """True when at most two words remain once the source-request phrases are removed."""
+    cleaned = SOURCE_REQUEST_RE.sub("", lowered)
+    # Count leftover alphanumeric tokens, bailing at the third instead of sub/strip/split copies
+    remaining = 0
+    for _ in _TOKEN_RE.finditer(cleaned):
+        remaining += 1
+        if remaining > 2:
+            return False
+    return True
+
+
+def detect_lowest_mpac(text: str) -> bool:
+    """Detect if user expresses lowest M-PAC (unmotivated/disengaged language)."""
+    return _lowest_mpac_lowered(text.lower())
 
 
 def detect_general_disinterest(text: str) -> bool:
     """Detect if user expresses general disinterest in physical activity."""
-    lowered = text.lower()
-    if "?" in lowered:
-        return False
-    return _contains_patterns(lowered, GENERAL_DISINTEREST_PATTERNS)
+    return _general_disinterest_lowered(text.lower())
 
 
 def detect_emotion_regulation(text: str) -> bool:
     """Detect if user expresses negative emotions about physical activity."""
-    lowered = text.lower()
-    if _contains_patterns(lowered, EMOTION_STRONG_PATTERNS):
-        return True
-    if _contains_patterns(lowered, EMOTION_WEAK_PATTERNS) and _contains_keywords(lowered, ACTIVITY_CONTEXT_KEYWORDS):
-        return True
-    return False
+    return _emotion_regulation_lowered(text.lower())
 
 
 def detect_module_request(text: str) -> bool:
     """Detect if user is asking about module/lesson content."""
-    lowered = text.lower()
-    return _contains_patterns(lowered, MODULE_REQUEST_PATTERNS)
+    return MODULE_REQUEST_RE.search(text.lower()) is not None
 
 
 def detect_lesson_lookup(text: str) -> bool:
     """Detect if user is asking which lesson covers a topic."""
-    lowered = text.lower()
-    return _contains_patterns(lowered, LESSON_LOOKUP_PATTERNS)
+    return LESSON_LOOKUP_RE.search(text.lower()) is not None
 
 
 def detect_educational_use_case(text: str, *, explicit_module_request: bool, decision: Optional["RouteDecision"]) -> bool:
@@ -72,14 +99,12 @@ def detect_educational_use_case(text: str, *, explicit_module_request: bool, dec
         return True
     if decision and decision.use_activities:
         return False
-    lowered = text.lower()
-    return _contains_patterns(lowered, EDUCATIONAL_REQUEST_PATTERNS)
+    return EDUCATIONAL_REQUEST_RE.search(text.lower()) is not None
 
 
 def detect_mpac_question(text: str) -> bool:
     """Detect if user is explicitly asking about the M-PAC framework or its named constructs."""
-    lowered = text.lower()
-    return _contains_patterns(lowered, MPAC_QUESTION_PATTERNS)
+    return MPAC_QUESTION_RE.search(text.lower()) is not None
 
 
 def detect_lesson_overview_request(text: str) -> Optional[int]:
@@ -89,21 +114,73 @@ def detect_lesson_overview_request(text: str) -> Optional[int]:
 
 def detect_technical_support_request(text: str) -> bool:
     """Detect if user is asking a technical support question about the app or devices."""
-    return _contains_patterns(text, TECHNICAL_SUPPORT_PATTERNS)
+    return TECHNICAL_SUPPORT_RE.search(text.lower()) is not None
 
 
 def detect_chatbot_help_request(text: str) -> bool:
     """Detect if user is asking what the chatbot can do or how to use it."""
-    return _contains_patterns(text, CHATBOT_HELP_PATTERNS)
+    return CHATBOT_HELP_RE.search(text.lower()) is not None
 
 
 def detect_sources_only(text: str) -> bool:
     """Detect if user is only asking for sources/references."""
-    lowered = text.lower()
-    if not any(pattern.search(lowered) for pattern in SOURCE_REQUEST_PATTERNS):
-        return False
-    cleaned = lowered
-    for pattern in SOURCE_REQUEST_PATTERNS:
-        cleaned = pattern.sub("", cleaned)
-    cleaned = re.sub(r"[^a-z0-9]+", " ", cleaned).strip()
-    return len(cleaned.split()) <= 2
+    return _sources_only_lowered(text.lower())
+
+
+class IntentFlags(IntFlag):
+    """Per-turn intent signals produced by a single classify_intent() pass."""
+
+    NONE = 0
+    SOURCE_REQUEST = auto()
+    SOURCES_ONLY = auto()
+    MPAC_QUESTION = auto()
+    LESSON_LOOKUP = auto()
+    MODULE_REQUEST = auto()
+    GENERAL_DISINTEREST = auto()
+    LOWEST_MPAC = auto()
+    EMOTION_REGULATION = auto()
+    EDUCATIONAL_REQUEST = auto()
+    TECHNICAL_SUPPORT = auto()
+    CHATBOT_HELP = auto()
+
+
+def classify_intent(text: str, *, lowered: Optional[str] = None) -> IntentFlags:
+    """
+    Run every intent detector once over the user text and return the combined flags.
+
+    Dependency rules are folded in so callers can test bits directly:
+    - MODULE_REQUEST is set for any explicit module request (source request,
+      module/lesson/slide mention, or lesson lookup).
+    - LOWEST_MPAC is set whenever GENERAL_DISINTEREST is set.
+    - EDUCATIONAL_REQUEST only reflects the educational patterns; the routing
+      decision still has to be applied by the caller (see detect_educational_use_case).
+
+    Pass ``lowered`` when the caller already holds ``text.lower()`` for this turn.
+    """
+    if lowered is None:
+        lowered = text.lower()
+    flags = IntentFlags.NONE
+    # Most turns are not source requests, so search once and only then check for "sources only"
+    if SOURCE_REQUEST_RE.search(lowered):
+        flags |= IntentFlags.SOURCE_REQUEST
+        if _only_source_terms(lowered):
+            flags |= IntentFlags.SOURCES_ONLY
+    if MPAC_QUESTION_RE.search(lowered):
+        flags |= IntentFlags.MPAC_QUESTION
+    if LESSON_LOOKUP_RE.search(lowered):
+        flags |= IntentFlags.LESSON_LOOKUP | IntentFlags.MODULE_REQUEST
+    if flags & (IntentFlags.SOURCE_REQUEST | IntentFlags.MODULE_REQUEST) or MODULE_REQUEST_RE.search(lowered):
+        flags |= IntentFlags.MODULE_REQUEST
+    if _general_disinterest_lowered(lowered):
+        flags |= IntentFlags.GENERAL_DISINTEREST | IntentFlags.LOWEST_MPAC
+    elif _lowest_mpac_lowered(lowered):
+        flags |= IntentFlags.LOWEST_MPAC
+    if _emotion_regulation_lowered(lowered):
+        flags |= IntentFlags.EMOTION_REGULATION
+    if EDUCATIONAL_REQUEST_RE.search(lowered):
+        flags |= IntentFlags.EDUCATIONAL_REQUEST
+    if TECHNICAL_SUPPORT_RE.search(lowered):
+        flags |= IntentFlags.TECHNICAL_SUPPORT
+    if CHATBOT_HELP_RE.search(lowered):
+        flags |= IntentFlags.CHATBOT_HELP
+    return flags
@@ -1,14 +1,79 @@
 """Text matching utilities for pattern and keyword detection."""
 
-from typing import List, Pattern
+import re
+from typing import List, Pattern, Sequence, Tuple
 
 
-def _contains_patterns(text: str, patterns: List[Pattern]) -> bool:
-    """Check if text matches any of the compiled regex patterns."""
-    return any(pattern.search(text) for pattern in patterns)
+def _combine_patterns(patterns: List[Pattern]) -> Pattern:
+    """Fold a pattern bank that shares one set of flags into a single alternation regex."""
+    flags = {pattern.flags for pattern in patterns}
+    if len(flags) > 1:
+        raise ValueError("Cannot combine patterns compiled with different flags")
+    flags = flags.pop() if flags else 0
+    return re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns), flags)
 
 
-def _contains_keywords(text: str, keywords: List[str]) -> bool:
-    """Check if text contains any of the keywords (case-insensitive)."""
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in keywords)
+def _guard_first_chars(pattern: Pattern, first_chars: str) -> Pattern:
+    r"""
+    Prefix a \b-led alternation with a lookahead on the characters its branches can start with.
+
+    A leading \b gives the engine no first-character prefilter, so every branch is tried at
+    every word boundary; the lookahead rejects most positions with one class test. Only valid
+    when every branch of ``pattern`` starts with \b and one of ``first_chars`` (a regex class body).
+    """
+    return re.compile(rf"\b(?=[{first_chars}])(?:{pattern.pattern})", pattern.flags)
+
+
+def _ascii_bytes_pattern(pattern: Pattern) -> Pattern:
+    r"""
+    Recompile an ASCII-only str pattern for bytes input.
+
+    On ASCII text the bytes engine gives the same matches (\w, \d, \b and IGNORECASE all agree
+    there) and skips Unicode character-class work. The one ASCII difference is that Unicode \s
+    also matches the \x1c-\x1f separators, so callers keep the str pattern for text that is
+    non-ASCII or contains them (see _is_plain_ascii).
+    """
+    return re.compile(pattern.pattern.encode("ascii"), pattern.flags & ~re.UNICODE)
+
+
+def _is_plain_ascii(text: str) -> bool:
+    """True when bytes twins from _ascii_bytes_pattern match exactly like their str patterns."""
+    # Four C-level substring probes; ~5x cheaper than a [\x1c-\x1f] regex search
+    return (
+        text.isascii()
+        and "\x1c" not in text
+        and "\x1d" not in text
+        and "\x1e" not in text
+        and "\x1f" not in text
+    )
+
+
+def _minimal_keywords(keywords: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Drop keywords that contain another keyword from the same list, shortest first.
+
+    For substring scans "like it" can never match when "like" did not, so the longer
+    entry is pure overhead on a miss; shorter survivors are tried first as they hit more.
+    """
+    unique = set(keywords)
+    kept = {keyword for keyword in unique if not any(other != keyword and other in keyword for other in unique)}
+    return tuple(sorted(kept, key=lambda keyword: (len(keyword), keyword)))
+
+
+def _contains_keywords(lowered: str, keywords: Tuple[str, ...]) -> bool:
+    """
+    Check if already-lowercased text contains any of the (lowercase) keywords.
+
+    ``keywords`` is a scan tuple built once at import with _minimal_keywords.
+
+    Deliberately one list per call: a unified single-pass matcher over all five layer keyword
+    lists (one ``finditer`` of a longest-first lookahead alternation, with each hit mapped to
+    every category owning a prefix of it) gives identical results but measured 4-8x slower
+    than these per-list str.find loops on 80-100 character turns.
+    """
+    # Substring probes are C-level str.find calls; for these short literal lists a plain loop
+    # beats both any(<genexpr>) and a compiled re.escape alternation (measured ~1.6x faster)
+    for keyword in keywords:
+        if keyword in lowered:
+            return True
+    return False
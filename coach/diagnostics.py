@@ -1,6 +1,11 @@
 """Diagnostic utilities for the coach module."""
 
-from rag.retriever import RagRetriever
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rag.retriever import RagRetriever
 
 
 def run_rag_sanity_check(retriever: RagRetriever) -> None:
@@ -0,0 +1,52 @@
+"""Bounded LRU cache of assistant replies keyed by the exact prompt sent to the model."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+_MessagesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache mapping a fully built message list to a final reply.
+
+    The key is the model name plus the complete prompt (system prompt with
+    inferred state, retrieval context, routing instructions, history and user
+    turn), so a hit is only possible when the same model would have seen
+    byte-identical input; one cache can back agents for different models. This keeps the
+    cache safe for a stateful coach while still skipping the LLM call for
+    repeated openers and canned questions shared across sessions.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[_MessagesKey, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(messages: List[Dict[str, str]], model: str) -> _MessagesKey:
+        return model, tuple((message["role"], message["content"]) for message in messages)
+
+    def get(self, messages: List[Dict[str, str]], *, model: str = "") -> Optional[str]:
+        key = self._key(messages, model)
+        with self._lock:
+            reply = self._entries.get(key)
+            if reply is not None:
+                self._entries.move_to_end(key)
+            return reply
+
+    def put(self, messages: List[Dict[str, str]], reply: str, *, model: str = "") -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._key(messages, model)
+        with self._lock:
+            self._entries[key] = reply
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
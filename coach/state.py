@@ -1,10 +1,10 @@
 """Dataclasses for conversation state and layer inference."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LayerSignals:
     """Stores detected cues that hint at reflective/regulatory/reflexive focus."""
 
@@ -27,7 +27,7 @@ class LayerSignals:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LayerInference:
     """Represents the inferred process layer and supporting metadata."""
 
@@ -36,7 +36,17 @@ class LayerInference:
     signals: LayerSignals
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class TurnInference:
+    """Bundles the per-turn inferences computed from a single lowercased copy of the input."""
+
+    layer: LayerInference
+    barrier: str | None
+    activities: str | None
+    time_available: str | None
+
+
+@dataclass(slots=True)
 class ConversationState:
     """Tracks inferred user context for prompt conditioning."""
 
@@ -48,10 +58,18 @@ class ConversationState:
     time_available: str = "unknown"
 
     def to_prompt_mapping(self) -> Dict[str, str]:
-        return asdict(self)
+        # Hand-written rather than dataclasses.asdict(), which recurses and deep-copies every field
+        return {
+            "process_layer": self.process_layer,
+            "layer_confidence": self.layer_confidence,
+            "pending_layer_question": self.pending_layer_question,
+            "barrier": self.barrier,
+            "activities": self.activities,
+            "time_available": self.time_available,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class _PreparedPrompt:
     """Internal dataclass for prepared prompt data."""
 
@@ -8,11 +8,27 @@ from __future__ import annotations
 
 import os
 
+from dotenv import load_dotenv
+
+# Settings below are read at import, so .env must be loaded first. `import coach` reaches this
+# without importing rag.config, and the CLI and eval entry points import coach before calling
+# load_dotenv() themselves. Deployments that inject the environment (containers, serverless
+# cold starts) can set RR_ENV_LOADED to skip the .env search and read.
+if not os.getenv("RR_ENV_LOADED"):
+    load_dotenv()
+
 # --- Message / session limits ---
 MAX_MESSAGE_LENGTH: int = int(os.getenv("MAX_MESSAGE_LENGTH", "10000"))
 MAX_HISTORY_MESSAGES: int = int(os.getenv("MAX_HISTORY_MESSAGES", "100"))
+# Approximate token budget for replayed history (~4 characters per token; 0 disables the budget)
+MAX_HISTORY_TOKENS: int = int(os.getenv("MAX_HISTORY_TOKENS", "0"))
+# Oldest exchanges dropped at once when history is full, so the replayed prefix stays
+# cacheable between compactions (0 keeps the sliding window of the last MAX_HISTORY_MESSAGES)
+HISTORY_COMPACT_EXCHANGES: int = int(os.getenv("HISTORY_COMPACT_EXCHANGES", "0"))
 SESSION_TTL_MINUTES: int = int(os.getenv("SESSION_TTL_MINUTES", "90"))
 STREAMING_TIMEOUT_SECONDS: int = int(os.getenv("STREAMING_TIMEOUT_SECONDS", "300"))
+# Max replies kept in the cross-session exact-prompt response cache (0 disables it)
+RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "0"))
 
 # --- Audio upload ---
 MAX_AUDIO_SIZE_BYTES: int = int(os.getenv("MAX_AUDIO_SIZE_MB", "10")) * 1024 * 1024
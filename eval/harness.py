@@ -112,7 +112,7 @@ class EvalHarness(CoachAgent):
         """
         # Fresh state per case — no cross-contamination between cases
         self.state = ConversationState()
-        self.history = []
+        self.history.clear()
         self.latest_retrieval = None
         self._instrumented.reset()
 
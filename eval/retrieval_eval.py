@@ -6,6 +6,8 @@ import re
 
 from eval.eval_types import EvalCase, RetrievalMetrics
 
+PERCENTAGE_RE = re.compile(r"\d+\s*%")
+
 
 def precision_at_k(retrieved: list[str], gold: list[str], k: int = 3) -> float:
     """Proportion of top-k retrieved chunks that are gold chunks."""
@@ -29,7 +31,7 @@ def mrr(retrieved: list[str], gold: list[str]) -> float:
 
 def check_hallucination_sentinel(response_text: str) -> bool:
     """Return True if the response contains a percentage figure (fabrication signal for master_009)."""
-    return bool(re.search(r"\d+\s*%", response_text))
+    return PERCENTAGE_RE.search(response_text) is not None
 
 
 def run_retrieval_eval(
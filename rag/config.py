@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 from dotenv import load_dotenv
 
-load_dotenv()
+# RAG settings are read from the environment, and the retriever and ingest can be imported without
+# config.app_config, so .env is loaded here as well (load_dotenv never overrides set variables).
+# Deployments that inject the environment themselves can set RR_ENV_LOADED to skip it.
+if not os.getenv("RR_ENV_LOADED"):
+    load_dotenv()
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = REPO_ROOT / "data"
@@ -18,10 +24,11 @@ MASTER_FILENAME = "reframing_retirement_master_data_set.txt"
 ACTIVITY_FILENAME = "reframing_retirement_activity_list.txt"
 HOME_FILENAME = "What_Can_You_Do_At_Home_data_set.txt"
 
-EMBED_DIMENSIONS = {
+# Read-only; an unknown model fails at config load instead of sizing collections for 3072 dims
+EMBED_DIMENSIONS = MappingProxyType({
     "text-embedding-3-large": 3072,
     "text-embedding-3-small": 1536,
-}
+})
 
 
 def _path_from_env(var_name: str, default: Path) -> Path:
@@ -66,13 +73,24 @@ class RagConfig:
     home_top_k: int = 4
 
 
+@lru_cache(maxsize=1)
 def load_rag_config() -> RagConfig:
-    """Load configuration from .env with safe defaults."""
+    """
+    Load configuration from .env with safe defaults.
+
+    The environment is read once per process and the same RagConfig is returned afterwards;
+    treat it as read-only (use dataclasses.replace for overrides) and call
+    load_rag_config.cache_clear() after changing the environment.
+    """
 
     openai_api_key = _read_openai_key()
     chat_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-large")
-    embedding_dimensions = EMBED_DIMENSIONS.get(embedding_model, 3072)
+    try:
+        embedding_dimensions = EMBED_DIMENSIONS[embedding_model]
+    except KeyError:
+        known = ", ".join(EMBED_DIMENSIONS)
+        raise ValueError(f"Unknown OPENAI_EMBEDDING_MODEL {embedding_model!r}; expected one of: {known}.") from None
 
     qdrant_url = os.getenv("QDRANT_URL", "http://localhost:6333")
     qdrant_api_key = os.getenv("QDRANT_API_KEY")
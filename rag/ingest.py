@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import logging
 import uuid
-from typing import Sequence
+from typing import Dict, Optional, Sequence
 
 from dotenv import load_dotenv
 from llama_index.core import Settings, StorageContext, VectorStoreIndex
@@ -17,7 +17,7 @@ from llama_index.core.schema import TextNode
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import Distance, OptimizersConfigDiff, PayloadSchemaType, VectorParams
 
 from rag.config import RagConfig, load_rag_config
 from rag.parsing_activities import ActivityChunk, parse_activity_file
@@ -27,6 +27,18 @@ from rag.parsing_master import MasterChunk, parse_master_file
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Activity payload fields RagRetriever filters on server-side
+ACTIVITY_FILTER_FIELDS = ("cost_label", "activity_type", "days")
+
+# Points per upsert request (3072-dim vectors make larger requests slow to serialize) and the
+# number of upload worker processes qdrant-client runs in parallel
+UPLOAD_BATCH_SIZE = 32
+UPLOAD_PARALLEL = 4
+
+# Texts per OpenAI embeddings request during ingest (LlamaIndex defaults to 10; the endpoint
+# accepts up to 2048 inputs, 256 keeps each request well under its token limit)
+EMBED_BATCH_SIZE = 256
+
 
 def _stable_uuid(value: str) -> str:
     """Return a deterministic UUID for a given chunk id."""
@@ -57,9 +69,37 @@ def _ensure_collection(client: QdrantClient, name: str, vector_size: int) -> Non
     )
 
 
+def _disable_indexing(client: QdrantClient, name: str) -> Optional[int]:
+    """Turn HNSW indexing off for the upload and return the threshold to restore afterwards."""
+
+    threshold = client.get_collection(name).config.optimizer_config.indexing_threshold
+    client.update_collection(
+        collection_name=name,
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+    )
+    return threshold
+
+
+def _restore_indexing(client: QdrantClient, name: str, threshold: Optional[int]) -> None:
+    client.update_collection(
+        collection_name=name,
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=threshold),
+    )
+
+
+def _index_payload_fields(client: QdrantClient, name: str, fields: Sequence[str]) -> None:
+    for field_name in fields:
+        client.create_payload_index(collection_name=name, field_name=field_name, field_schema=PayloadSchemaType.KEYWORD)
+
+
 def _upsert_nodes(config: RagConfig, client: QdrantClient, collection: str, nodes: Sequence[TextNode]) -> None:
     node_list = list(nodes)
-    vector_store = QdrantVectorStore(client=client, collection_name=collection)
+    vector_store = QdrantVectorStore(
+        client=client,
+        collection_name=collection,
+        batch_size=UPLOAD_BATCH_SIZE,
+        parallel=UPLOAD_PARALLEL,
+    )
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
     VectorStoreIndex(nodes=node_list, storage_context=storage_context)
     logger.info("Inserted %s nodes into %s", len(node_list), collection)
@@ -69,7 +109,11 @@ def run_ingest() -> None:
     load_dotenv()
     config = load_rag_config()
 
-    Settings.embed_model = OpenAIEmbedding(model=config.embedding_model, api_key=config.openai_api_key)
+    Settings.embed_model = OpenAIEmbedding(
+        model=config.embedding_model,
+        api_key=config.openai_api_key,
+        embed_batch_size=EMBED_BATCH_SIZE,
+    )
 
     logger.info("Parsing master dataset from %s", config.master_data_path)
     master_chunks = parse_master_file(config.master_data_path)
@@ -80,13 +124,21 @@ def run_ingest() -> None:
 
     client = QdrantClient(url=config.qdrant_url, api_key=config.qdrant_api_key)
 
-    _ensure_collection(client, config.master_collection, config.embedding_dimensions)
-    _ensure_collection(client, config.activities_collection, config.embedding_dimensions)
-    _ensure_collection(client, config.home_collection, config.embedding_dimensions)
-
-    _upsert_nodes(config, client, config.master_collection, _to_nodes(master_chunks))
-    _upsert_nodes(config, client, config.activities_collection, _to_nodes(activity_chunks))
-    _upsert_nodes(config, client, config.home_collection, _to_nodes(home_chunks))
+    # Upload with indexing off so each HNSW graph is built once, after every point is in. The
+    # collection's own threshold is restored even if an upload fails, so it never stays unindexed.
+    previous_thresholds: Dict[str, Optional[int]] = {}
+    try:
+        for collection in (config.master_collection, config.activities_collection, config.home_collection):
+            _ensure_collection(client, collection, config.embedding_dimensions)
+            previous_thresholds[collection] = _disable_indexing(client, collection)
+        _index_payload_fields(client, config.activities_collection, ACTIVITY_FILTER_FIELDS)
+
+        _upsert_nodes(config, client, config.master_collection, _to_nodes(master_chunks))
+        _upsert_nodes(config, client, config.activities_collection, _to_nodes(activity_chunks))
+        _upsert_nodes(config, client, config.home_collection, _to_nodes(home_chunks))
+    finally:
+        for collection, threshold in previous_thresholds.items():
+            _restore_indexing(client, collection, threshold)
 
     logger.info("Ingestion complete.")
 
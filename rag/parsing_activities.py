@@ -5,7 +5,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 CHUNK_DIVIDER = re.compile(r"\n\*{5,}\s*\n", flags=re.MULTILINE)
 HEADER_PATTERN = re.compile(r"(?P<id>\d+)\.\s*(?P<name>[^\n]+)")
@@ -13,6 +13,7 @@ DAY_PATTERN = re.compile(
     r"\b(Mondays?|Tuesdays?|Wednesdays?|Thursdays?|Fridays?|Saturdays?|Sundays?|Weekends?|Daily)\b",
     flags=re.IGNORECASE,
 )
+COST_VALUE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
 
 TYPE_KEYWORDS = {
     "yoga": ["yoga"],
@@ -26,6 +27,16 @@ TYPE_KEYWORDS = {
     "mind-body": ["tai chi", "soqi", "somatic", "mobility"],
 }
 
+# (substrings of the lowercased location, aliases added when any of them appears), in order
+LOCATION_ALIASES = (
+    (("pear kes", "gr pearkes", "g.r. pearkes"), ("saanich", "g. r. pearkes", "pearkes")),
+    (("silver threads",), ("silver threads", "fernwood", "downtown", "fairfield")),
+    (("crystal pool",), ("crystal pool", "fernwood", "downtown")),
+    (("cedar hill",), ("cedar hill",)),
+    (("online",), ("online", "virtual", "home")),
+    (("oak bay", "uplands"), ("oak bay", "uplands", "oak bay recreation centre")),
+)
+
 
 @dataclass
 class ActivityChunk:
@@ -37,19 +48,34 @@ class ActivityChunk:
 
 
 def _split_chunks(text: str) -> Iterable[str]:
-    for piece in CHUNK_DIVIDER.split(text):
-        cleaned = piece.strip()
+    # Slice between divider matches instead of materialising the full split() list up front
+    start = 0
+    for divider in CHUNK_DIVIDER.finditer(text):
+        cleaned = text[start:divider.start()].strip()
         if cleaned:
             yield cleaned
+        start = divider.end()
+    cleaned = text[start:].strip()
+    if cleaned:
+        yield cleaned
 
 
-def _extract_field(lines: List[str], label: str) -> str:
-    prefix = f"{label.lower()}:"
+def _extract_fields(lines: List[str], labels: Sequence[str]) -> Dict[str, str]:
+    """Return the value after "<label>:" on the first matching line for each label ("" if absent)."""
+    wanted = {f"{label.lower()}:": label for label in labels}
+    fields = dict.fromkeys(labels, "")
     for line in lines:
-        lowered = line.lower().strip()
-        if lowered.startswith(prefix):
-            return line.split(":", 1)[1].strip()
-    return ""
+        colon = line.find(":")
+        if colon < 0:
+            continue
+        # A line starts with "label:" exactly when its text up to the first colon is that prefix
+        label = wanted.pop(line[: colon + 1].lower(), None)
+        if label is None:
+            continue
+        fields[label] = line[colon + 1 :].strip()
+        if not wanted:
+            break
+    return fields
 
 
 def _infer_cost_label(cost: str) -> str:
@@ -64,7 +90,7 @@ def _infer_cost_label(cost: str) -> str:
 
 
 def _extract_cost_value(cost: str) -> Optional[float]:
-    match = re.search(r"(\d+(?:\.\d+)?)", cost.replace(",", ""))
+    match = COST_VALUE_PATTERN.search(cost.replace(",", ""))
     if match:
         try:
             return float(match.group(1))
@@ -117,18 +143,9 @@ def _infer_activity_type(name: str, description: str) -> str:
 def _location_aliases(location: str) -> List[str]:
     lowered = location.lower()
     aliases: List[str] = []
-    if "pear kes" in lowered or "gr pearkes" in lowered or "g.r. pearkes" in lowered:
-        aliases.extend(["saanich", "g. r. pearkes", "pearkes"])
-    if "silver threads" in lowered:
-        aliases.extend(["silver threads", "fernwood", "downtown", "fairfield"])
-    if "crystal pool" in lowered:
-        aliases.extend(["crystal pool", "fernwood", "downtown"])
-    if "cedar hill" in lowered:
-        aliases.append("cedar hill")
-    if "online" in lowered:
-        aliases.extend(["online", "virtual", "home"])
-    if "oak bay" in lowered or "uplands" in lowered:
-        aliases.extend(["oak bay", "uplands", "oak bay recreation centre"])
+    for markers, marker_aliases in LOCATION_ALIASES:
+        if any(marker in lowered for marker in markers):
+            aliases.extend(marker_aliases)
     return aliases
 
 
@@ -150,10 +167,11 @@ def parse_activity_file(path: Path) -> List[ActivityChunk]:
         name = header_match.group("name").strip()
 
         lines = [line.strip() for line in segment.splitlines() if line.strip()]
-        what = _extract_field(lines, "What")
-        where = _extract_field(lines, "Where")
-        when_text = _extract_field(lines, "When")
-        cost = _extract_field(lines, "Cost")
+        fields = _extract_fields(lines, ("What", "Where", "When", "Cost"))
+        what = fields["What"]
+        where = fields["Where"]
+        when_text = fields["When"]
+        cost = fields["Cost"]
 
         cost_label = _infer_cost_label(cost)
         cost_value = _extract_cost_value(cost)
@@ -14,6 +14,10 @@ SLIDE_PATTERN = re.compile(r"L(?P<lesson>\d+)-S(?P<slide>\d+)-G(?P<global>\d+)",
 SB_SLIDE_PATTERN = re.compile(r"SB(?P<module>\d+)-S(?P<slide>\d+)-G(?P<global>\d+)", flags=re.IGNORECASE)
 TITLE_PATTERN = re.compile(r"^Title:\s*(.+)$", flags=re.IGNORECASE | re.MULTILINE)
 CONTENT_PATTERN = re.compile(r"Content:\s*(.+)", flags=re.IGNORECASE | re.DOTALL)
+DESCRIPTION_LINE_PATTERN = re.compile(r"Lesson Description:\s*(.+)", flags=re.IGNORECASE)
+TITLE_SUFFIX_PATTERN = re.compile(r"\(\d+[^)]*\)$")
+SLIDE_MARKER_PATTERN = re.compile(r"\+\+\+\s*")
+MULTI_SPACE_PATTERN = re.compile(r"\s{2,}")
 
 
 @dataclass
@@ -27,7 +31,7 @@ class MasterChunk:
 
 def _clean_lesson_title(raw_title: str) -> str:
     title = raw_title.strip()
-    title = re.sub(r"\(\d+[^)]*\)$", "", title).strip()
+    title = TITLE_SUFFIX_PATTERN.sub("", title).strip()
     return title
 
 
@@ -36,7 +40,7 @@ def _extract_slide_title(chunk: str) -> str:
     if match:
         return match.group(1).strip()
     # fallback for lesson description slides
-    desc_match = re.search(r"Lesson Description:\s*(.+)", chunk, flags=re.IGNORECASE)
+    desc_match = DESCRIPTION_LINE_PATTERN.search(chunk)
     if desc_match:
         return desc_match.group(1).strip()
     return ""
@@ -47,16 +51,22 @@ def _extract_content(chunk: str) -> str:
     if match:
         return match.group(1).strip()
     # no explicit content block, return chunk minus markers
-    cleaned = re.sub(r"\+\+\+\s*", "", chunk)
-    cleaned = re.sub(r"\s{2,}", " ", cleaned)
+    cleaned = SLIDE_MARKER_PATTERN.sub("", chunk)
+    cleaned = MULTI_SPACE_PATTERN.sub(" ", cleaned)
     return cleaned.strip()
 
 
 def _split_chunks(text: str) -> Iterable[str]:
-    for piece in CHUNK_DIVIDER.split(text):
-        cleaned = piece.strip()
+    # Slice between divider matches instead of materialising the full split() list up front
+    start = 0
+    for divider in CHUNK_DIVIDER.finditer(text):
+        cleaned = text[start:divider.start()].strip()
         if cleaned:
             yield cleaned
+        start = divider.end()
+    cleaned = text[start:].strip()
+    if cleaned:
+        yield cleaned
 
 
 LESSON_DESCRIPTION_PATTERN = re.compile(r"Lesson Description:\s*(.+)", flags=re.IGNORECASE | re.DOTALL)
@@ -121,7 +131,7 @@ def parse_master_file(path: Path) -> List[MasterChunk]:
             science_module_titles[module_num] = science_match.group("title").strip()
 
         slide_match = SLIDE_PATTERN.search(segment)
-        sb_match = SB_SLIDE_PATTERN.search(segment)
+        sb_match = SB_SLIDE_PATTERN.search(segment) if slide_match is None else None
 
         if slide_match:
             lesson_number = int(slide_match.group("lesson"))
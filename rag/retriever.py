@@ -5,12 +5,15 @@ from __future__ import annotations
 import html
 import re
 import logging
+import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import Any, Dict, List, Optional, Sequence
 
 from llama_index.core import Settings, VectorStoreIndex
-from llama_index.core.retrievers import VectorIndexRetriever
+from llama_index.core.vector_stores import FilterOperator, MetadataFilter, MetadataFilters, VectorStoreQuery
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 from qdrant_client import QdrantClient
@@ -21,6 +24,12 @@ from rag.router import ActivityFilters, RouteDecision
 logger = logging.getLogger(__name__)
 
 _RAG_CACHE_SIZE = 256  # Max cached (query, decision) results per retriever instance
+_EMBED_CACHE_SIZE = 512  # Max cached query embeddings per retriever instance
+_RETRIEVAL_WORKERS = 12  # Shared pool: up to three collections for ~4 concurrent gather_context calls
+
+# Applied to every retrieved chunk on every turn, so compiled once here
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
+_SLIDE_COUNT_RE = re.compile(r"\s*\(\d+\s*slides?\)")
 
 
 def _node_content(node: Any) -> str:
@@ -61,16 +70,14 @@ def _sanitize_text(text: str) -> str:
         return ""
 
     # Remove control characters (except newlines and tabs)
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
+    text = _CONTROL_CHARS_RE.sub("", text)
 
     # Escape HTML entities (if content ever displayed in web UI)
     text = html.escape(text, quote=False)
 
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-
-    return text
+    # Normalize whitespace: split() drops leading/trailing runs and splits on the same Unicode
+    # whitespace as r"\s+", without the regex rewriting every single space
+    return " ".join(text.split())
 
 
 def _truncate(text: str, limit: int = 1200) -> str:
@@ -90,7 +97,7 @@ def _truncate(text: str, limit: int = 1200) -> str:
     return f"{cleaned[:limit].rstrip()}..."
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedChunk:
     doc_type: str
     text: str
@@ -133,7 +140,7 @@ class RetrievedChunk:
             if self.metadata.get("content_type") == "science":
                 module = self.metadata.get("science_module_number")
                 module_title = self.metadata.get("science_module_title") or "Untitled module"
-                module_title = re.sub(r"\s*\(\d+\s*slides?\)", "", module_title).strip()
+                module_title = _SLIDE_COUNT_RE.sub("", module_title).strip()
                 slide = self.metadata.get("science_slide_number")
                 slide_title = self.metadata.get("slide_title") or "Untitled slide"
                 return f"Science Module {module}, Slide {slide}: {slide_title}"
@@ -156,7 +163,7 @@ class RetrievedChunk:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievalResult:
     master_chunks: Sequence[RetrievedChunk]
     activity_chunks: Sequence[RetrievedChunk]
@@ -196,15 +203,10 @@ class RetrievalResult:
         return "\n".join(lines)
 
     def references(self) -> List[str]:
-        refs: List[str] = []
-        seen = set()
-        chunks = list(self.master_chunks) + list(self.activity_chunks) + list(self.home_chunks)
-        for chunk in sorted(chunks, key=self._reference_sort_key):
-            citation = chunk.reference()
-            if citation and citation not in seen:
-                seen.add(citation)
-                refs.append(citation)
-        return refs
+        # sorted() computes each sort key once; lesson/slide order (not retrieval score order) is
+        # the citation order users see, so the sort stays. dict.fromkeys dedupes in that order.
+        chunks = sorted(chain(self.master_chunks, self.activity_chunks, self.home_chunks), key=self._reference_sort_key)
+        return list(dict.fromkeys(citation for citation in (chunk.reference() for chunk in chunks) if citation))
 
 
 class RagRetriever:
@@ -220,29 +222,93 @@ class RagRetriever:
             logger.info(f"Qdrant connection verified at {config.qdrant_url}")
         except Exception as exc:
             raise RuntimeError(f"Cannot connect to Qdrant at {config.qdrant_url}: {exc}") from exc
-        self.master_index = self._build_index(config.master_collection)
-        self.activity_index = self._build_index(config.activities_collection)
-        self.home_index = self._build_index(config.home_collection)
-        self._cache: dict = {}  # (query, decision_key) -> RetrievalResult
+        # Indexes are built on first use: each build costs a Qdrant round trip, and many sessions
+        # never touch the activity or at-home collections
+        self._indexes: Dict[str, VectorStoreIndex] = {}
+        self._index_lock = threading.Lock()
+        # LRU caches keyed on the stripped query; the lock guards lookups racing evictions
+        # across concurrent requests and retrieval threads
+        self._cache: "OrderedDict[tuple, RetrievalResult]" = OrderedDict()  # (query, decision_key) -> result
+        self._embed_cache: "OrderedDict[str, List[float]]" = OrderedDict()  # query -> embedding, all indexes
+        self._cache_lock = threading.Lock()
+        # Created once so multi-collection turns don't spawn and join fresh threads every query
+        self._executor = ThreadPoolExecutor(max_workers=_RETRIEVAL_WORKERS, thread_name_prefix="rag-retrieval")
 
     def _build_index(self, collection_name: str) -> VectorStoreIndex:
         vector_store = QdrantVectorStore(client=self.client, collection_name=collection_name)
         return VectorStoreIndex.from_vector_store(vector_store=vector_store)
 
-    def _build_retriever(self, index: VectorStoreIndex, top_k: int) -> VectorIndexRetriever:
-        return index.as_retriever(similarity_top_k=top_k)
-
-    def _retrieve_chunks(self, index: VectorStoreIndex, query: str, top_k: int, default_doc_type: str) -> List[RetrievedChunk]:
+    def _index(self, collection_name: str) -> VectorStoreIndex:
+        index = self._indexes.get(collection_name)
+        if index is None:
+            with self._index_lock:
+                index = self._indexes.get(collection_name)
+                if index is None:
+                    index = self._build_index(collection_name)
+                    self._indexes[collection_name] = index
+        return index
+
+    @property
+    def master_index(self) -> VectorStoreIndex:
+        return self._index(self.config.master_collection)
+
+    @property
+    def activity_index(self) -> VectorStoreIndex:
+        return self._index(self.config.activities_collection)
+
+    @property
+    def home_index(self) -> VectorStoreIndex:
+        return self._index(self.config.home_collection)
+
+    def _embed_query(self, query: str) -> List[float]:
+        """
+        Return the query embedding, computing it at most once per distinct query.
+
+        All indexes share Settings.embed_model, so one embedding serves master, activity and
+        home retrieval alike instead of each VectorIndexRetriever re-embedding the same text.
+        """
+        key = query.strip()
+        with self._cache_lock:
+            embedding = self._embed_cache.get(key)
+            if embedding is not None:
+                self._embed_cache.move_to_end(key)
+                return embedding
+        # Same call VectorIndexRetriever makes internally when the bundle has no embedding
+        embedding = Settings.embed_model.get_agg_embedding_from_queries([key])
+        with self._cache_lock:
+            self._embed_cache[key] = embedding
+            if len(self._embed_cache) > _EMBED_CACHE_SIZE:
+                self._embed_cache.popitem(last=False)  # evict least recently used
+        return embedding
+
+    def _retrieve_chunks(
+        self,
+        index: VectorStoreIndex,
+        query: str,
+        top_k: int,
+        default_doc_type: str,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[RetrievedChunk]:
         """Retrieve nodes from an index and wrap them into RetrievedChunk objects."""
-        nodes = self._build_retriever(index, top_k).retrieve(query)
+        # Query the vector store directly with the cached embedding. A per-call VectorIndexRetriever
+        # issues this same query but adds retriever construction, callback/instrumentation spans and
+        # NodeWithScore wrapping; Qdrant stores full TextNodes, so it never needs the docstore.
+        vector_query = VectorStoreQuery(
+            query_embedding=self._embed_query(query),
+            similarity_top_k=top_k,
+            query_str=query,
+            filters=filters,
+        )
+        result = index.vector_store.query(vector_query)
+        similarities = result.similarities
         return [
             RetrievedChunk(
-                doc_type=node.node.metadata.get("doc_type", default_doc_type),
-                text=_node_content(node.node),
-                metadata=node.node.metadata,
-                score=node.score,
+                doc_type=node.metadata.get("doc_type", default_doc_type),
+                text=_node_content(node),
+                metadata=node.metadata,
+                score=similarities[position] if similarities is not None else None,
             )
-            for node in nodes
+            for position, node in enumerate(result.nodes or [])
         ]
 
     def retrieve_master(self, query: str, top_k: Optional[int] = None, *, prefer_science: bool = False) -> List[RetrievedChunk]:
@@ -268,13 +334,40 @@ class RagRetriever:
         top_k: Optional[int] = None,
     ) -> List[RetrievedChunk]:
         base_top_k = top_k or self.config.activity_top_k
-        retrieval_top_k = max(base_top_k * 2, 8) if filters and filters.days else base_top_k
-        chunks = self._retrieve_chunks(self.activity_index, query, retrieval_top_k, "activity")
+        # Cost, type and days are filtered by Qdrant; only the location substring/alias match is
+        # left to Python, so over-fetch just for that
+        retrieval_top_k = max(base_top_k * 2, 8) if filters and filters.location else base_top_k
+        server_filters = self._activity_payload_filters(filters) if filters else None
+        chunks = self._retrieve_chunks(self.activity_index, query, retrieval_top_k, "activity", server_filters)
         if filters:
             chunks = self._apply_activity_filters(chunks, filters)
         return chunks[:base_top_k]
 
+    @staticmethod
+    def _activity_payload_filters(filters: ActivityFilters) -> Optional[MetadataFilters]:
+        """
+        Translate the exact-match activity filters into a Qdrant payload filter.
+
+        Parsed metadata and router filters share casing ("free", "yoga", "Monday"), so these
+        match server-side exactly as _apply_activity_filters does. The payload indexes only
+        speed this up; Qdrant applies the filter to unindexed fields too. _apply_activity_filters
+        still runs afterwards for the location substring/alias match, which has no payload
+        equivalent, and for case-insensitive day matching.
+        """
+        conditions: List[MetadataFilter] = []
+        if filters.cost_label:
+            conditions.append(MetadataFilter(key="cost_label", value=filters.cost_label))
+        if filters.activity_type:
+            conditions.append(MetadataFilter(key="activity_type", value=filters.activity_type))
+        if filters.days:
+            conditions.append(MetadataFilter(key="days", value=list(filters.days), operator=FilterOperator.IN))
+        return MetadataFilters(filters=conditions) if conditions else None
+
     def _apply_activity_filters(self, chunks: List[RetrievedChunk], filters: ActivityFilters) -> List[RetrievedChunk]:
+        # Normalize the filter side once per call rather than once per chunk
+        target_location = filters.location.lower() if filters.location else None
+        target_days = {day.lower() for day in filters.days} if filters.days else None
+
         def matches(chunk: RetrievedChunk) -> bool:
             metadata = chunk.metadata
             if filters.cost_label:
@@ -283,15 +376,13 @@ class RagRetriever:
             if filters.activity_type:
                 if metadata.get("activity_type") != filters.activity_type:
                     return False
-            if filters.location:
-                location = (metadata.get("location") or "").lower()
-                aliases = [alias.lower() for alias in metadata.get("aliases", [])]
-                target = filters.location.lower()
-                if target not in location and target not in aliases:
+            if target_location:
+                if target_location not in (metadata.get("location") or "").lower() and not any(
+                    alias.lower() == target_location for alias in metadata.get("aliases", [])
+                ):
                     return False
-            if filters.days:
-                chunk_days = [day.lower() for day in metadata.get("days", [])]
-                if not any(day.lower() in chunk_days for day in filters.days):
+            if target_days:
+                if target_days.isdisjoint(day.lower() for day in metadata.get("days", [])):
                     return False
             return True
 
@@ -322,7 +413,7 @@ class RagRetriever:
         filters = decision.activity_filters
         filters_key = (
             filters.cost_label,
-            tuple(filters.days or []),
+            filters.days or (),
             filters.location,
             filters.activity_type,
         ) if filters else None
@@ -336,10 +427,13 @@ class RagRetriever:
         )
 
     def gather_context(self, query: str, decision: RouteDecision) -> RetrievalResult:
-        cache_key = (query, self._decision_key(decision))
-        if cache_key in self._cache:
-            logger.debug("RAG cache hit for query: %.40s...", query)
-            return self._cache[cache_key]
+        cache_key = (query.strip(), self._decision_key(decision))
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                logger.debug("RAG cache hit for query: %.40s...", query)
+                return cached
 
         # Build a map of collection name -> callable for each enabled collection,
         # then run them in parallel via threads (I/O-bound: Qdrant + embedding calls).
@@ -357,22 +451,25 @@ class RagRetriever:
             )
 
         results_map: Dict[str, List[RetrievedChunk]] = {}
+        if len(tasks) > 1:
+            # Embed once up front so the parallel retrievals all hit the embedding cache
+            self._embed_query(query)
         if len(tasks) == 1:
             # Single collection: no thread overhead needed
             name, fn = next(iter(tasks.items()))
             results_map[name] = fn()
         elif len(tasks) > 1:
-            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
-                future_to_name = {executor.submit(fn): name for name, fn in tasks.items()}
-                for future in as_completed(future_to_name):
-                    results_map[future_to_name[future]] = future.result()
+            future_to_name = {self._executor.submit(fn): name for name, fn in tasks.items()}
+            for future in as_completed(future_to_name):
+                results_map[future_to_name[future]] = future.result()
 
         result = RetrievalResult(
             master_chunks=results_map.get("master", []),
             activity_chunks=results_map.get("activity", []),
             home_chunks=results_map.get("home", []),
         )
-        if len(self._cache) >= _RAG_CACHE_SIZE:
-            self._cache.pop(next(iter(self._cache)))  # evict oldest entry
-        self._cache[cache_key] = result
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > _RAG_CACHE_SIZE:
+                self._cache.popitem(last=False)  # evict least recently used
         return result
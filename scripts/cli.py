@@ -51,13 +51,16 @@ def main() -> None:
             print("Goodbye!")
             break
 
+        # Stream so the reply starts printing at the first token rather than after full generation
+        print("Coach: ", end="", flush=True)
         try:
-            response = agent.generate_response(user_text)
+            for piece in agent.stream_response(user_text):
+                print(piece, end="", flush=True)
         except Exception as exc:
             print(f"[Error contacting coach model: {exc}]")
             continue
 
-        print(f"Coach: {response}\n")
+        print("\n")
 
 
 if __name__ == "__main__":
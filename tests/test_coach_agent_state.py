@@ -1,6 +1,8 @@
 """Tests for CoachAgent state updates:makes sure the agent's state flips to the right layer when someone gives clear info, and falls back to a clarifying question when they're vague."""
 
 import unittest
+from collections import deque
+from unittest.mock import patch
 
 from coach import CoachAgent, LAYER_CONFIDENCE_THRESHOLD
 from coach.constants import FREQUENCY_QUESTION, TIMEFRAME_QUESTION
@@ -13,8 +15,17 @@ class DummyClient:
 
 
 class CoachAgentStateTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Only the first agent loads lesson overviews from disk; each test still gets fresh state
+        cls._template_agent = CoachAgent(client=DummyClient(), model="test-model")
+
     def setUp(self) -> None:
-        self.agent = CoachAgent(client=DummyClient(), model="test-model")
+        self.agent = CoachAgent(
+            client=DummyClient(),
+            model="test-model",
+            lesson_overviews=self._template_agent.lesson_overviews,
+        )
 
     def test_update_state_sets_layer_when_confident(self) -> None:
         self.agent._update_state("I walked 3 times this week for about 20 minutes.")
@@ -45,6 +56,55 @@ class CoachAgentStateTests(unittest.TestCase):
         self.agent._update_state("I've kept those walks going for months now.")
         self.assertIsNone(self.agent.state.pending_layer_question)
 
+    def test_history_trim_drops_oldest_exchanges_over_budget(self) -> None:
+        for index in range(5):
+            self.agent.history.append({"role": "user", "content": f"q{index}" + "x" * 98})
+            self.agent.history.append({"role": "assistant", "content": f"a{index}" + "y" * 98})
+        self.agent._trim_history_to_budget(max_tokens=100)
+        self.assertEqual(len(self.agent.history), 4)
+        self.assertTrue(self.agent.history[0]["content"].startswith("q3"))
+        self.assertEqual(self.agent.history[0]["role"], "user")
+
+    def test_history_trim_keeps_latest_exchange(self) -> None:
+        self.agent.history.append({"role": "user", "content": "x" * 1000})
+        self.agent.history.append({"role": "assistant", "content": "y" * 1000})
+        self.agent._trim_history_to_budget(max_tokens=10)
+        self.assertEqual(len(self.agent.history), 2)
+
+    def _record_exchanges(self, maxlen: int, count: int) -> list:
+        self.agent.history = deque(maxlen=maxlen)
+        for index in range(count):
+            self.agent._record_exchange(f"q{index}", f"a{index}")
+        return [m["content"] for m in self.agent.history]
+
+    def test_full_history_keeps_sliding_window_by_default(self) -> None:
+        self.assertEqual(
+            self._record_exchanges(maxlen=8, count=5),
+            ["q1", "a1", "q2", "a2", "q3", "a3", "q4", "a4"],
+        )
+
+    def test_full_history_compacts_in_one_block(self) -> None:
+        with patch("coach.agent.HISTORY_COMPACT_EXCHANGES", 2):
+            contents = self._record_exchanges(maxlen=8, count=5)
+            self.assertEqual(contents, ["q2", "a2", "q3", "a3", "q4", "a4"])
+            # The next exchange fits, so the replayed prefix is unchanged
+            self.agent._record_exchange("q5", "a5")
+        self.assertEqual(self.agent.history[0]["content"], "q2")
+        self.assertEqual(len(self.agent.history), 8)
+
+    def test_compaction_keeps_latest_exchanges(self) -> None:
+        with patch("coach.agent.HISTORY_COMPACT_EXCHANGES", 50):
+            contents = self._record_exchanges(maxlen=10, count=6)
+        self.assertEqual(contents, ["q3", "a3", "q4", "a4", "q5", "a5"])
+
+    def test_compaction_with_odd_and_small_limits_keeps_whole_exchanges(self) -> None:
+        with patch("coach.agent.HISTORY_COMPACT_EXCHANGES", 2):
+            for maxlen in (2, 3, 4, 5, 7):
+                contents = self._record_exchanges(maxlen=maxlen, count=6)
+                self.assertEqual(len(contents) % 2, 0, maxlen)
+                self.assertTrue(contents[0].startswith("q"), maxlen)
+                self.assertEqual(contents[-2:], ["q5", "a5"], maxlen)
+            self.assertEqual(self._record_exchanges(maxlen=5, count=6), ["q4", "a4", "q5", "a5"])
 
 if __name__ == "__main__":
     unittest.main()
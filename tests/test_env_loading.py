@@ -0,0 +1,48 @@
+"""Tests that .env settings reach coach when it is imported before any entry point loads .env."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class EnvLoadingTests(unittest.TestCase):
+    def test_import_coach_uses_dotenv_settings(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # load_dotenv() searches upward from the calling module, so use a copy with its own .env
+            for package in ("coach", "config", "rag"):
+                shutil.copytree(
+                    PROJECT_ROOT / package,
+                    Path(tmp) / package,
+                    ignore=shutil.ignore_patterns("__pycache__"),
+                )
+            (Path(tmp) / ".env").write_text('MAX_HISTORY_MESSAGES="6"\n')
+            env = {
+                key: value
+                for key, value in os.environ.items()
+                if key not in {"RR_ENV_LOADED", "MAX_HISTORY_MESSAGES"}
+            }
+            env["PYTHONPATH"] = tmp
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import coach; "
+                    "print(coach.CoachAgent(client=None, model='m', lesson_overviews={}).history.maxlen)",
+                ],
+                cwd=tmp,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        self.assertEqual(result.stdout.strip(), "6")
+
+
+if __name__ == "__main__":
+    unittest.main()
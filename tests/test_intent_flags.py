@@ -0,0 +1,47 @@
+"""Tests for classify_intent: the folded dependency rules between intent flags."""
+
+import unittest
+
+from coach.detection.detectors import IntentFlags, classify_intent
+
+
+class ClassifyIntentTests(unittest.TestCase):
+    def test_source_request_sets_module_request(self) -> None:
+        flags = classify_intent("Can you show me the sources for that?")
+        self.assertIn(IntentFlags.SOURCE_REQUEST, flags)
+        self.assertIn(IntentFlags.MODULE_REQUEST, flags)
+
+    def test_lesson_lookup_sets_module_request(self) -> None:
+        flags = classify_intent("Which lesson covers walking?")
+        self.assertIn(IntentFlags.LESSON_LOOKUP, flags)
+        self.assertIn(IntentFlags.MODULE_REQUEST, flags)
+
+    def test_general_disinterest_sets_lowest_mpac(self) -> None:
+        flags = classify_intent("I don't want to exercise.")
+        self.assertIn(IntentFlags.GENERAL_DISINTEREST, flags)
+        self.assertIn(IntentFlags.LOWEST_MPAC, flags)
+
+    def test_sources_only_requires_source_request(self) -> None:
+        flags = classify_intent("Sources please")
+        self.assertIn(IntentFlags.SOURCES_ONLY, flags)
+        self.assertIn(IntentFlags.SOURCE_REQUEST, flags)
+        # A source request with more to say is not "sources only"
+        flags = classify_intent("Where did that come from? Also I walked with my dog for a long time today")
+        self.assertIn(IntentFlags.SOURCE_REQUEST, flags)
+        self.assertNotIn(IntentFlags.SOURCES_ONLY, flags)
+        # No source request at all never sets SOURCES_ONLY, even for very short turns
+        self.assertNotIn(IntentFlags.SOURCES_ONLY, classify_intent("ok"))
+
+    def test_technical_support_matches_mixed_case(self) -> None:
+        self.assertIn(IntentFlags.TECHNICAL_SUPPORT, classify_intent("My FitBit Won't Sync"))
+
+    def test_chatbot_help_matches_mixed_case(self) -> None:
+        self.assertIn(IntentFlags.CHATBOT_HELP, classify_intent("What Can You Do?"))
+
+    def test_lowered_argument_matches_text(self) -> None:
+        text = "Which Lesson covers WALKING?"
+        self.assertEqual(classify_intent(text, lowered=text.lower()), classify_intent(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,15 @@
 
 import unittest
 
-from coach.prompts import build_coach_prompt
+from coach.prompts import (
+    BASE_PROMPT,
+    build_coach_prompt,
+    build_coach_prompt_parts,
+    build_coach_prompts,
+    build_state_block,
+    state_block_for,
+)
+from coach.state import ConversationState
 
 
 class PromptBuilderTests(unittest.TestCase):
@@ -23,6 +31,31 @@ class PromptBuilderTests(unittest.TestCase):
         self.assertIn("Preferred activities: walking", prompt)
         self.assertIn("Time available today: 15 minutes", prompt)
 
+    def test_prompt_parts_split_static_prefix_from_state(self) -> None:
+        state = {"process_layer": "reflective", "barrier": "time pressure"}
+        prefix, state_block = build_coach_prompt_parts(state)
+        self.assertIs(prefix, BASE_PROMPT)
+        self.assertNotIn("Process layer", prefix)
+        self.assertIn("Process layer: reflective", state_block)
+        self.assertEqual(f"{prefix}\n\n{state_block}", build_coach_prompt(state))
+
+    def test_batch_build_matches_single_builds(self) -> None:
+        states = [{}, {"process_layer": "regulatory"}, {}, {"barrier": "weather", "layer_confidence": 0.5}]
+        prompts = build_coach_prompts(states)
+        self.assertEqual(prompts, [build_coach_prompt(state) for state in states])
+
+    def test_agent_state_and_mapping_share_cached_state_block(self) -> None:
+        state = ConversationState()
+        block = state_block_for(
+            process_layer=state.process_layer,
+            layer_confidence=state.layer_confidence,
+            pending_layer_question=state.pending_layer_question,
+            barrier=state.barrier,
+            activities=state.activities,
+            time_available=state.time_available,
+        )
+        self.assertIs(block, build_state_block({}))
+
 
 if __name__ == "__main__":
     unittest.main()
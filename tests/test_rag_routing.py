@@ -13,8 +13,9 @@ if str(PROJECT_ROOT) not in sys.path:
 
 try:
     from coach import CoachAgent
-    from rag.retriever import RetrievedChunk, RetrievalResult
-    from rag.router import QueryRouter, RouteDecision
+    from llama_index.core.vector_stores import FilterOperator
+    from rag.retriever import RagRetriever, RetrievedChunk, RetrievalResult
+    from rag.router import ActivityFilters, QueryRouter, RouteDecision
 
     RAG_AVAILABLE = True
 except ModuleNotFoundError as exc:
@@ -190,6 +191,41 @@ else:
                 decision = router.route(query)
                 self.assertFalse(decision.prefer_science, f"Expected prefer_science=False for: {query!r}")
 
+        def test_router_days_are_immutable_in_shared_decisions(self) -> None:
+            router = QueryRouter()
+            decision = router.route("Any free walking groups on Monday or Wednesday?")
+            self.assertEqual(decision.activity_filters.days, ("Monday", "Wednesday"))
+            self.assertIs(router.route("Any free walking groups on Monday or Wednesday?"), decision)
+
+        def test_router_memo_is_per_instance(self) -> None:
+            query = "Any yoga classes in Oak Bay?"
+            decision = QueryRouter().route(query)
+            fresh = QueryRouter().route(query)
+            self.assertIsNot(fresh, decision)
+            self.assertEqual(fresh, decision)
+
+        def test_activity_payload_filters_cover_exact_match_fields(self) -> None:
+            filters = ActivityFilters(
+                cost_label="free",
+                days=("Monday", "Wednesday"),
+                location="Oak Bay",
+                activity_type="yoga",
+            )
+            payload = RagRetriever._activity_payload_filters(filters)
+            conditions = {condition.key: condition for condition in payload.filters}
+            # Location is matched in Python only (substring or alias)
+            self.assertEqual(set(conditions), {"cost_label", "activity_type", "days"})
+            self.assertEqual(conditions["cost_label"].operator, FilterOperator.EQ)
+            self.assertEqual(conditions["cost_label"].value, "free")
+            self.assertEqual(conditions["activity_type"].operator, FilterOperator.EQ)
+            self.assertEqual(conditions["activity_type"].value, "yoga")
+            self.assertEqual(conditions["days"].operator, FilterOperator.IN)
+            self.assertEqual(conditions["days"].value, ["Monday", "Wednesday"])
+
+        def test_activity_payload_filters_none_without_exact_match_fields(self) -> None:
+            self.assertIsNone(RagRetriever._activity_payload_filters(ActivityFilters()))
+            self.assertIsNone(RagRetriever._activity_payload_filters(ActivityFilters(location="Oak Bay")))
+
         def test_science_chunk_label_format(self) -> None:
             chunk = _science_chunk()
             self.assertEqual(chunk.label(), "Science Module 1 Slide 2: Did you know?")
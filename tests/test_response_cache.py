@@ -0,0 +1,85 @@
+"""Tests for the exact-prompt ResponseCache and its use by CoachAgent."""
+
+import unittest
+
+from coach import CoachAgent
+from coach.response_cache import ResponseCache
+
+
+class StubCompletion:
+    def __init__(self, text: str) -> None:
+        message = type("Msg", (), {"content": text})
+        choice = type("Choice", (), {"message": message()})
+        self.choices = [choice()]
+
+
+class StubChatCompletions:
+    def __init__(self, client: "StubClient") -> None:
+        self._client = client
+
+    def create(self, **kwargs):
+        self._client.calls.append(kwargs)
+        return StubCompletion(f"Stub reply {len(self._client.calls)}")
+
+
+class StubChat:
+    def __init__(self, client: "StubClient") -> None:
+        self.completions = StubChatCompletions(client)
+
+
+class StubClient:
+    def __init__(self) -> None:
+        self.calls = []
+        self.chat = StubChat(self)
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def test_lru_eviction(self) -> None:
+        cache = ResponseCache(max_entries=2)
+        first = [{"role": "user", "content": "a"}]
+        second = [{"role": "user", "content": "b"}]
+        third = [{"role": "user", "content": "c"}]
+        cache.put(first, "A")
+        cache.put(second, "B")
+        self.assertEqual(cache.get(first), "A")
+        cache.put(third, "C")
+        self.assertIsNone(cache.get(second))
+        self.assertEqual(cache.get(first), "A")
+        self.assertEqual(len(cache), 2)
+
+    def test_fresh_sessions_share_cached_opening_reply(self) -> None:
+        stub_client = StubClient()
+        cache = ResponseCache()
+        first = CoachAgent(client=stub_client, model="fake-model", response_cache=cache, lesson_overviews={})
+        second = CoachAgent(client=stub_client, model="fake-model", response_cache=cache, lesson_overviews={})
+
+        reply_one = first.generate_response("Hello coach")
+        reply_two = second.generate_response("Hello coach")
+
+        self.assertEqual(reply_one, reply_two)
+        self.assertEqual(len(stub_client.calls), 1)
+        self.assertEqual(second.history[1]["content"], reply_one)
+
+    def test_follow_up_turn_misses_because_history_differs(self) -> None:
+        stub_client = StubClient()
+        agent = CoachAgent(client=stub_client, model="fake-model", response_cache=ResponseCache(), lesson_overviews={})
+
+        agent.generate_response("Hello coach")
+        agent.generate_response("Hello coach")
+
+        self.assertEqual(len(stub_client.calls), 2)
+
+    def test_agents_on_different_models_do_not_share_replies(self) -> None:
+        stub_client = StubClient()
+        cache = ResponseCache()
+        first = CoachAgent(client=stub_client, model="fake-model", response_cache=cache, lesson_overviews={})
+        second = CoachAgent(client=stub_client, model="other-model", response_cache=cache, lesson_overviews={})
+
+        first.generate_response("Hello coach")
+        second.generate_response("Hello coach")
+
+        self.assertEqual(len(stub_client.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import unittest
 from coach import (
     LAYER_CONFIDENCE_THRESHOLD,
     LayerSignals,
+    classify_batch,
     infer_process_layer,
     pick_layer_question,
 )
@@ -64,6 +65,22 @@ class ProcessLayerInferenceTests(unittest.TestCase):
         self.assertLess(result.confidence, LAYER_CONFIDENCE_THRESHOLD)
         self.assertEqual(pick_layer_question(result.signals), FREQUENCY_QUESTION)
 
+    def test_classify_batch_matches_per_message_inference(self) -> None:
+        texts = [
+            "I walk 3 times a week and have for months.",
+            "ok",
+            "I keep meaning to walk but honestly haven't started yet.",
+            "OK",
+        ]
+        results = classify_batch(texts)
+        self.assertEqual(len(results), len(texts))
+        for text, result in zip(texts, results):
+            expected = infer_process_layer(text)
+            self.assertEqual(result.layer, expected.layer)
+            self.assertEqual(result.confidence, expected.confidence)
+            self.assertEqual(result.signals, expected.signals)
+        self.assertIs(results[1], results[3])
+
     def test_frequency_question_when_no_behavior_signals(self) -> None:
         signals = LayerSignals()
         self.assertEqual(pick_layer_question(signals), FREQUENCY_QUESTION)